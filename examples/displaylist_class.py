@@ -0,0 +1,57 @@
+"""
+This is an example file on how to use the DisplayList class implemented at
+https://github.com/rcbadiale/espaper-micropython.
+
+MIT License
+
+Copyright (c) 2020 Rafael C. Badiale.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from time import sleep
+
+from displaylist import DisplayList
+from draw import Draw
+
+
+def main(portrait=False):
+    d = Draw(portrait)
+
+    width = d.size[0]
+    height = d.size[1]
+
+    # Static layout, recorded once and executed on every frame
+    layout = DisplayList()
+    layout.rect(0, 0, width - 1, height - 1, 0)
+    layout.hline(0, 12, width, 0)
+    layout.text('display list', 4, 2, 0)
+    layout.line(0, height - 1, width - 1, 12, 0)
+
+    # Region changed by the layout
+    print(layout.bounds(d.size))
+
+    # The same list can be sent to (or received from) a server
+    layout = DisplayList.from_bytes(layout.to_bytes())
+
+    for n in range(3):
+        d.blank_image()
+        layout.run(d)
+        d.text('frame {}'.format(n), 4, height // 2, 0)
+        d.draw()
+        sleep(15)
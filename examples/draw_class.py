@@ -24,6 +24,8 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
+from time import sleep
+
 from draw import Draw
 from font import font
 
@@ -92,3 +94,29 @@ def main(portrait=False):
         d.text(letter, x, y, 0)
 
     d.draw()
+
+    sleep(15)
+
+    # Second screen with the filled shapes
+    d.blank_image()
+
+    # Triangle with fill and a bold zigzag
+    d.triangle(
+        width // 6, height // 6, width // 3, height // 6,
+        width // 6, height // 3, 0, True
+    )
+    d.polyline(
+        [(x, 2 * height // 3 + (x % 20)) for x in range(0, width, 10)], 0, 3
+    )
+
+    # Filled polygon (arrow) and a thick line
+    d.polygon((
+        (width // 2, height // 6), (2 * width // 3, height // 4),
+        (width // 2, height // 3), (width // 2, 7 * height // 24),
+        (5 * width // 12, 7 * height // 24),
+        (5 * width // 12, 5 * height // 24),
+        (width // 2, 5 * height // 24),
+    ), 0, True)
+    d.thick_line(width // 6, height // 2, 5 * width // 6, height // 2, 0, 5)
+
+    d.draw()
@@ -0,0 +1,54 @@
+"""
+This is an example file on how to use the Draw class (on double buffer mode)
+implemented at https://github.com/rcbadiale/espaper-micropython.
+
+MIT License
+
+Copyright (c) 2020 Rafael C. Badiale.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from time import sleep_ms
+
+from draw import Draw
+
+
+def main(frames=10):
+    d = Draw(fast=True, double=True)
+
+    width = d.size[0]
+    height = d.size[1]
+
+    d.rect(0, 0, width - 1, height - 1, 0)
+    for n in range(frames):
+        # Rendered while the previous frame is still refreshing
+        d.rect(8, 8, width - 9, 24, 1, True)
+        d.text('frame {}'.format(n), 8, 8, 0)
+        d.rect(8, 32, width - 9, height - 9, 1, True)
+        for x in range(8, width - 8, 4):
+            y = 32 + (x * 7 + n * 13) % (height - 40)
+            d.vline(x, y, height - 8 - y, 0)
+
+        # A frame still waiting to be sent would be replaced (dropped)
+        # by the next one, so wait until the previous one was sent
+        while d.pending:
+            sleep_ms(10)
+
+        # Returns right away, the frame is sent as soon as BUSY is LOW
+        d.draw()
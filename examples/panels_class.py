@@ -0,0 +1,48 @@
+"""
+This is an example file on how to use the Panels class implemented at
+https://github.com/rcbadiale/espaper-micropython.
+
+MIT License
+
+Copyright (c) 2020 Rafael C. Badiale.
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from machine import SPI
+
+from draw import Draw
+from panels import Panels
+
+
+def main(fast=False):
+    spi = SPI(1, baudrate=4000000, polarity=0, phase=0)
+    # The first display uses the ESPaper pins, the second one has its
+    # own CS, BUSY and RESET pins on the same SPI bus and DC pin.
+    displays = [
+        Draw(fast=fast, spi=spi),
+        Draw(fast=fast, spi=spi, cs=16, busy=12, rst=0),
+    ]
+    panels = Panels(displays)
+
+    for n, d in enumerate(displays):
+        d.text('panel {}'.format(n), 0, 0, 0)
+        d.rect(0, 16, d.size[0] - 1, d.size[1] - 1, 0)
+
+    cycle_time = panels.refresh()
+    print('cycle time: {} ms'.format(cycle_time))
@@ -0,0 +1,354 @@
+"""
+MIT License
+
+Copyright (c) 2020 Rafael C. Badiale
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from array import array
+from struct import pack, unpack_from
+
+from draw import line_runs
+from font import font
+
+# Commands, each one is recorded as (op, a, b, c, d, arg)
+BOX = 0
+RECT = 1
+LINE = 2
+TEXT = 3
+BLIT = 4
+GLYPH = 5
+FIELDS = 6
+
+
+class DisplayList:
+    """
+    This class records drawing commands to be executed later on a
+    Draw object, the same list can be executed on every frame.
+
+    The commands are kept in a compact array and, when executed, they
+    are clipped to the screen once and grouped by byte row (or byte
+    column on portrait) of the image buffer, keeping the drawing order
+    inside each one of them.
+
+    Colors: 0 = black, 1 = white.
+    """
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        """Remove all the recorded commands."""
+        self.cmds = array('h')
+        self.data = []
+        self._compiled = None
+        self._key = None
+
+    def __len__(self):
+        return len(self.cmds) // FIELDS
+
+    def _record(self, op, a, b, c, d, arg):
+        self.cmds.extend((op, a, b, c, d, arg))
+        self._compiled = None
+
+    def _store(self, item):
+        self.data.append(item)
+        return len(self.data) - 1
+
+    def pixel(self, x: int, y: int, color: int):
+        """Record a pixel."""
+        self._record(BOX, x, y, x, y, color != 0)
+
+    def line(self, xi: int, yi: int, xf: int, yf: int, color: int):
+        """Record a line, both ends included."""
+        self._record(LINE, xi, yi, xf, yf, color != 0)
+
+    def hline(self, xi: int, yi: int, length: int, color: int):
+        """Record a horizontal line with length pixels."""
+        if length > 0:
+            self._record(BOX, xi, yi, xi + length - 1, yi, color != 0)
+
+    def vline(self, xi: int, yi: int, length: int, color: int):
+        """Record a vertical line with length pixels."""
+        if length > 0:
+            self._record(BOX, xi, yi, xi, yi + length - 1, color != 0)
+
+    def rect(self, xi: int, yi: int, xf: int, yf: int, color: int, fill=False):
+        """Record a box (filled or not), both corners included."""
+        self._record(
+            BOX if fill else RECT,
+            min(xi, xf), min(yi, yf), max(xi, xf), max(yi, yf),
+            color != 0
+        )
+
+    def text(self, text: str, xo: int, yo: int, color: int):
+        """Record a text, (xo, yo) as on Draw.text."""
+        if text:
+            index = self._store(text)
+            self._record(TEXT, xo, yo, len(text), 0, index << 1 | (color != 0))
+
+    def blit(self, buf, xo: int, yo: int, width: int, height: int):
+        """
+        Record a copy of an image to the position (xo, yo).
+
+        args:
+          buf (bytes): image with one bit per pixel, rows of
+            (width + 7) // 8 bytes, MSB first (MONO_HLSB).
+          xo (int): x position on the screen (left of the image).
+          yo (int): y position on the screen (top of the image).
+          width (int): image width in pixels.
+          height (int): image height in pixels.
+        """
+        index = self._store(bytes(buf))
+        self._record(BLIT, xo, yo, width, height, index << 1)
+
+    def _extent(self, n):
+        """Return the (x0, y0, x1, y1) extent of the command n."""
+        cmds = self.cmds
+        i = n * FIELDS
+        op, a, b = cmds[i], cmds[i + 1], cmds[i + 2]
+        c, d = cmds[i + 3], cmds[i + 4]
+        if op == LINE:
+            return min(a, c), min(b, d), max(a, c), max(b, d)
+        if op == TEXT:
+            return a, b, a + 8 * c - 1, b + 7
+        if op == BLIT:
+            return a, b, a + c - 1, b + d - 1
+        return a, b, c, d
+
+    def bounds(self, size=None):
+        """
+        Region changed by the recorded commands.
+
+        args:
+          size (tuple): screen size (x, y) to clip the region.
+
+        returns:
+          (x0, y0, x1, y1) region with both corners included, or None
+          when nothing would be drawn.
+        """
+        region = None
+        for n in range(len(self)):
+            x0, y0, x1, y1 = self._extent(n)
+            if size is not None:
+                x0, y0 = max(x0, 0), max(y0, 0)
+                x1, y1 = min(x1, size[0] - 1), min(y1, size[1] - 1)
+                if x0 > x1 or y0 > y1:
+                    continue
+            if region is None:
+                region = (x0, y0, x1, y1)
+            else:
+                region = (
+                    min(region[0], x0), min(region[1], y0),
+                    max(region[2], x1), max(region[3], y1)
+                )
+        return region
+
+    def to_bytes(self):
+        """
+        Serialize the display list.
+
+        Format (little endian): b'DL', number of commands and of data
+        items (2 x uint16), the commands (6 x int16 each) then the data
+        items, each one as kind (uint8, 0 = text, 1 = image), length
+        (uint16) and content.
+        """
+        out = [b'DL', pack('<HH', len(self), len(self.data))]
+        for n in range(len(self)):
+            out.append(pack('<6h', *self.cmds[n * FIELDS:(n + 1) * FIELDS]))
+        for item in self.data:
+            if isinstance(item, str):
+                item = item.encode()
+                out.append(pack('<BH', 0, len(item)))
+            else:
+                out.append(pack('<BH', 1, len(item)))
+            out.append(item)
+        return b''.join(out)
+
+    @classmethod
+    def from_bytes(cls, buf):
+        """Create a display list from the to_bytes format."""
+        if buf[:2] != b'DL':
+            raise ValueError('not a display list')
+        dl = cls()
+        n_cmds, n_data = unpack_from('<HH', buf, 2)
+        offset = 6
+        for _ in range(n_cmds):
+            dl.cmds.extend(unpack_from('<6h', buf, offset))
+            offset += 12
+        for _ in range(n_data):
+            kind, length = unpack_from('<BH', buf, offset)
+            offset += 3
+            item = bytes(buf[offset:offset + length])
+            offset += length
+            dl.data.append(item.decode() if kind == 0 else item)
+        return dl
+
+    def _compile(self, size, portrait):
+        """
+        Clip the commands and split them by byte row (or column).
+
+        returns:
+          bands (list): array of (op, x0, y0, x1, y1, arg) entries for
+            each byte row, on the drawing order.
+          glyphs (list): (template, x, y, color) of each letter.
+        """
+        w, h = size
+        glyphs = []
+        bands = [array('h') for _ in range(((w if portrait else h) + 7) >> 3)]
+
+        def add(op, x0, y0, x1, y1, arg):
+            # Clip to the screen and split into byte rows (or columns)
+            x0, y0 = max(x0, 0), max(y0, 0)
+            x1, y1 = min(x1, w - 1), min(y1, h - 1)
+            if x0 > x1 or y0 > y1:
+                return
+            p0, p1 = (x0, x1) if portrait else (y0, y1)
+            for band in range(p0 >> 3, (p1 >> 3) + 1):
+                lo = max(p0, band << 3)
+                hi = min(p1, (band << 3) + 7)
+                if portrait:
+                    bands[band].extend((op, lo, y0, hi, y1, arg))
+                else:
+                    bands[band].extend((op, x0, lo, x1, hi, arg))
+
+        cmds = self.cmds
+        for n in range(len(self)):
+            i = n * FIELDS
+            op, a, b = cmds[i], cmds[i + 1], cmds[i + 2]
+            c, d, arg = cmds[i + 3], cmds[i + 4], cmds[i + 5]
+            if op == BOX:
+                add(BOX, a, b, c, d, arg)
+            elif op == RECT:
+                add(BOX, a, b, c, b, arg)
+                add(BOX, a, d, c, d, arg)
+                add(BOX, a, b, a, d, arg)
+                add(BOX, c, b, c, d, arg)
+            elif op == LINE:
+                for run in line_runs(a, b, c, d):
+                    add(BOX, run[0], run[1], run[2], run[3], arg)
+            elif op == TEXT:
+                # One entry for each letter, pointing to its glyph
+                for offset, letter in enumerate(self.data[arg >> 1]):
+                    template = font.get(letter)
+                    if template is None:
+                        continue
+                    x = a + 8 * offset
+                    add(GLYPH, x, b, x + 7, b + 7, len(glyphs))
+                    glyphs.append((template, x, b, arg & 1))
+            elif op == BLIT:
+                add(BLIT, a, b, a + c - 1, b + d - 1, n)
+        return bands, glyphs
+
+    def run(self, d):
+        """
+        Execute the recorded commands on the image buffer of d.
+
+        The clipped commands are kept until the list or the screen
+        changes, so executing it again only draws.
+
+        args:
+          d (Draw): where the commands are executed.
+        """
+        key = (d.size, d.portrait)
+        if self._compiled is None or self._key != key:
+            self._compiled = self._compile(d.size, d.portrait)
+            self._key = key
+        bands, glyphs = self._compiled
+        # Entries are read by index, slicing the arrays would allocate
+        for e in bands:
+            for i in range(0, len(e), FIELDS):
+                op = e[i]
+                if op == BOX:
+                    d._box(e[i + 1], e[i + 2], e[i + 3], e[i + 4], e[i + 5])
+                elif op == GLYPH:
+                    self._glyph(
+                        d, e[i + 1], e[i + 2], e[i + 3], e[i + 4],
+                        glyphs[e[i + 5]]
+                    )
+                elif op == BLIT:
+                    self._blit(
+                        d, e[i + 1], e[i + 2], e[i + 3], e[i + 4], e[i + 5]
+                    )
+
+    def _glyph(self, d, x0, y0, x1, y1, glyph):
+        """Draw the part (x0, y0, x1, y1) of a letter."""
+        template, xo, yo, color = glyph
+        for x in range(x0, x1 + 1):
+            line = template[x - xo]
+            # Vertical runs of set bits, same bit order as Draw.text
+            start = None
+            for y in range(y0, y1 + 2):
+                shift = y - yo if d.portrait else 7 - (y - yo)
+                if y <= y1 and (line >> shift) & 1:
+                    if start is None:
+                        start = y
+                elif start is not None:
+                    d._box(x, start, x, y - 1, color)
+                    start = None
+
+    def _blit(self, d, x0, y0, x1, y1, n):
+        """
+        Draw the part (x0, y0, x1, y1) of an image, inside one byte row
+        (or column on portrait).
+
+        Each byte of the image buffer is built from the image bits then
+        written at once, masking the bits outside of the part.
+        """
+        cmds = self.cmds
+        i = n * FIELDS
+        xo, yo, width = cmds[i + 1], cmds[i + 2], cmds[i + 3]
+        buf = self.data[cmds[i + 5] >> 1]
+        stride = (width + 7) >> 3
+        image = d.image
+        if d.portrait:
+            # Each byte is up to 8 bits of a row from the image, which
+            # may take 2 bytes from it
+            mask = (0xff >> (x0 & 0x07)) & (0xff << (7 - (x1 & 0x07))) & 0xff
+            keep = mask ^ 0xff
+            dx = x0 - xo
+            two = (dx >> 3) < stride - 1
+            shift = 8 - (dx & 0x07) + (x0 & 0x07)
+            step = d.size[0] >> 3
+            index = y0 * step + (x0 >> 3)
+            row = (y0 - yo) * stride + (dx >> 3)
+            for _ in range(y1 - y0 + 1):
+                word = buf[row] << 8
+                if two:
+                    word |= buf[row + 1]
+                image[index] = (image[index] & keep) | ((word >> shift) & mask)
+                index += step
+                row += stride
+        else:
+            # Each byte is up to 8 bits of a column from the image
+            mask = (0xff >> (y0 & 0x07)) & (0xff << (7 - (y1 & 0x07))) & 0xff
+            keep = mask ^ 0xff
+            base = (y0 >> 3) * d.size[0]
+            rows = range((y0 - yo) * stride, (y1 - yo + 1) * stride, stride)
+            first = 7 - (y0 & 0x07)
+            for x in range(x0, x1 + 1):
+                dx = x - xo
+                col = dx >> 3
+                bit = 7 - (dx & 0x07)
+                value = 0
+                offset = first
+                for row in rows:
+                    value |= ((buf[row + col] >> bit) & 1) << offset
+                    offset -= 1
+                index = base + x
+                image[index] = (image[index] & keep) | value
@@ -25,22 +25,106 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.
 """
-from math import floor, sqrt
+from math import ceil, floor, sqrt
+
+from machine import Pin, disable_irq, enable_irq
 
 from epaper import Display
 from font import font
 
 
+def line_runs(xi: int, yi: int, xf: int, yf: int):
+    """
+    Split a line in horizontal or vertical runs (Bresenham).
+
+    args:
+      xi (int): first x position on the screen.
+      yi (int): first y position on the screen.
+      xf (int): last x position on the screen.
+      yf (int): last y position on the screen.
+
+    yields:
+      (xa, ya, xb, yb) boxes covering the line, both ends included.
+    """
+    dx = abs(xf - xi)
+    dy = abs(yf - yi)
+    sx = 1 if xf >= xi else -1
+    sy = 1 if yf >= yi else -1
+    x, y = xi, yi
+    if dx >= dy:
+        # Horizontal runs, one for each y
+        err = dx >> 1
+        start = x
+        for _ in range(dx):
+            x += sx
+            err -= dy
+            if err < 0:
+                err += dx
+                yield min(start, x - sx), y, max(start, x - sx), y
+                y += sy
+                start = x
+        yield min(start, x), y, max(start, x), y
+    else:
+        # Vertical runs, one for each x
+        err = dy >> 1
+        start = y
+        for _ in range(dy):
+            y += sy
+            err -= dx
+            if err < 0:
+                err += dy
+                yield x, min(start, y - sy), x, max(start, y - sy)
+                x += sx
+                start = y
+        yield x, min(start, y), x, max(start, y)
+
+
 class Draw(Display):
-    def __init__(self, portrait=False, fast=False):
-        super(Draw, self).__init__(portrait, fast)
+    def __init__(self, portrait=False, fast=False, double=False, **pins):
+        super(Draw, self).__init__(portrait, fast, **pins)
+
+        # Front buffer, the frame waiting to be sent (double buffer mode)
+        self.front = None
+        self.pending = False
+        if double:
+            self.front = bytearray(self.n_bytes)
+            self.busy.irq(trigger=Pin.IRQ_FALLING, handler=self._on_idle)
 
     def draw(self):
         """
         Draw the buffered image to the display.
+
+        On double buffer mode the image is copied to the front buffer
+        and it returns without waiting. The front buffer is sent right
+        away when the display is idle, otherwise as soon as BUSY goes
+        LOW (from the BUSY pin interrupt). Meanwhile the next frame can
+        be drawn on the image buffer, a frame still waiting to be sent
+        is replaced by the newer one.
+
+        The interrupt writes to the SPI bus, so on this mode the bus
+        should not be shared with other displays.
         """
-        self.write_image()
-        self.update()
+        if self.front is None:
+            self.write_image()
+            self.update()
+            return
+        state = disable_irq()
+        self.front[:] = self.image
+        self.pending = True
+        idle = not self.is_busy()
+        enable_irq(state)
+        if idle:
+            self._on_idle()
+
+    def _on_idle(self, pin=None):
+        """Send the front buffer if there is a frame waiting."""
+        state = disable_irq()
+        pending = self.pending
+        self.pending = False
+        enable_irq(state)
+        if pending:
+            self.write_image(self.front)
+            self.update(wait=False)
 
     def text(self, text: str, xo: int, yo: int, color: int):
         """
@@ -110,7 +194,8 @@ class Draw(Display):
         """
         Draw a line in the image buffer.
 
-        This is the most generic line function.
+        This is the most generic line function. Both ends are included,
+        the line is drawn as horizontal or vertical runs (see line_runs).
 
         args:
           xi (int): first x position on the screen.
@@ -119,16 +204,8 @@ class Draw(Display):
           yf (int): last y position on the screen.
           color (int): 0 = black, 1 = white.
         """
-        if xi == xf:
-            self.vline(xi, yi, yf - yi, color)
-        elif yi == yf:
-            self.hline(xi, yi, xf - xi, color)
-        else:
-            m = (yf - yi) / (xf - xi)
-
-            for x in range(xi, xf + 1):
-                y = int(m * (x - xi) + yi)
-                self.pixel(x, y, color)
+        for xa, ya, xb, yb in line_runs(xi, yi, xf, yf):
+            self.box(xa, ya, xb, yb, color)
 
     def hline(self, xi: int, yi: int, length: int, color: int):
         """
@@ -140,8 +217,8 @@ class Draw(Display):
           length (int): the length in pixels of the line to draw.
           color (int): 0 = black, 1 = white.
         """
-        for x in range(length):
-            self.pixel(xi + x, yi, color)
+        if length > 0:
+            self.box(xi, yi, xi + length - 1, yi, color)
 
     def vline(self, xi: int, yi: int, length: int, color: int):
         """
@@ -153,13 +230,15 @@ class Draw(Display):
           length (int): the length in pixels of the line to draw.
           color (int): 0 = black, 1 = white.
         """
-        for y in range(length):
-            self.pixel(xi, yi + y, color)
+        if length > 0:
+            self.box(xi, yi, xi, yi + length - 1, color)
 
     def rect(self, xi: int, yi: int, xf: int, yf: int, color: int, fill=False):
         """
         Draw a box (filled or not) in the image buffer.
 
+        Both corners are included.
+
         args:
           xi (int): first x position on the screen.
           yi (int): first y position on the screen.
@@ -168,18 +247,65 @@ class Draw(Display):
           color (int): 0 = black, 1 = white.
           fill (bool): if the box should be filled or not.
         """
-        width = xf - xi
-        height = yf - yi
-
         if fill:
-            for x in range(xi, xf + 1):
-                for y in range(yi, yf + 1):
-                    self.pixel(x, y, color)
+            self.box(xi, yi, xf, yf, color)
+        else:
+            self.box(xi, yi, xf, yi, color)
+            self.box(xi, yf, xf, yf, color)
+            self.box(xi, yi, xi, yf, color)
+            self.box(xf, yi, xf, yf, color)
+
+    def box(self, xi: int, yi: int, xf: int, yf: int, color: int):
+        """
+        Fill a box in the image buffer, clipped to the screen.
+
+        args:
+          xi (int): first x position on the screen.
+          yi (int): first y position on the screen.
+          xf (int): last x position on the screen.
+          yf (int): last y position on the screen.
+          color (int): 0 = black, 1 = white.
+        """
+        xi, xf = max(min(xi, xf), 0), min(max(xi, xf), self.size[0] - 1)
+        yi, yf = max(min(yi, yf), 0), min(max(yi, yf), self.size[1] - 1)
+        if xi <= xf and yi <= yf:
+            self._box(xi, yi, xf, yf, color)
+
+    def _box(self, xi: int, yi: int, xf: int, yf: int, color: int):
+        """
+        Fill a box already clipped to the screen.
+
+        The box is written one byte row (or column on portrait) at
+        a time, masking all the bits of the box in each byte at once.
+        """
+        image = self.image
+        if self.portrait:
+            # HMSB, the bits of each byte are along x
+            p0, p1, q0, q1 = xi, xf, yi, yf
+            p_step, q_step = 1, self.size[0] >> 3
         else:
-            self.hline(xi, yi, width, color)
-            self.hline(xi, yf, width, color)
-            self.vline(xi, yi, height, color)
-            self.vline(xf, yi, height, color)
+            # VMSB, the bits of each byte are along y
+            p0, p1, q0, q1 = yi, yf, xi, xf
+            p_step, q_step = self.size[0], 1
+        first = p0 >> 3
+        last = p1 >> 3
+        for band in range(first, last + 1):
+            # Only the first and last bytes are partially filled
+            mask = 0xff
+            if band == first:
+                mask >>= p0 & 0x07
+            if band == last:
+                mask &= 0xff << (7 - (p1 & 0x07))
+            base = band * p_step
+            start = base + q0 * q_step
+            stop = base + q1 * q_step + 1
+            if color:
+                for index in range(start, stop, q_step):
+                    image[index] |= mask
+            else:
+                mask ^= 0xff
+                for index in range(start, stop, q_step):
+                    image[index] &= mask
 
     def circle(self, xo: int, yo: int, radius: int, color: int, fill=False):
         """
@@ -211,3 +337,251 @@ class Draw(Display):
                 self.circle(xo, yo, radius - 1, color, True)
             else:
                 self.circle(xo, yo, radius - 1, color, False)
+
+    def polygon(self, points, color: int, fill=False):
+        """
+        Draw a closed polygon (filled or not) in the image buffer.
+
+        The fill uses the even-odd rule, so crossing edges leave holes.
+
+        args:
+          points (list): (x, y) positions of the vertices on the screen,
+            int or float (the outline is drawn on the nearest pixels).
+          color (int): 0 = black, 1 = white.
+          fill (bool): if the polygon should be filled or not.
+        """
+        if fill:
+            self._fill((points,), color)
+        self._stroke(points, color, True)
+
+    def triangle(
+        self, x0: int, y0: int, x1: int, y1: int, x2: int, y2: int,
+        color: int, fill=False
+    ):
+        """
+        Draw a triangle (filled or not) in the image buffer.
+
+        args:
+          x0, y0 (int): first vertex position on the screen.
+          x1, y1 (int): second vertex position on the screen.
+          x2, y2 (int): third vertex position on the screen.
+          color (int): 0 = black, 1 = white.
+          fill (bool): if the triangle should be filled or not.
+        """
+        self.polygon(((x0, y0), (x1, y1), (x2, y2)), color, fill)
+
+    def thick_line(
+        self, xi: int, yi: int, xf: int, yf: int, color: int, width: int
+    ):
+        """
+        Draw a line with the given width in the image buffer.
+
+        Both ends are included, the line is filled as a rectangle
+        around it (a width by width square when both ends are equal).
+
+        args:
+          xi (int): first x position on the screen.
+          yi (int): first y position on the screen.
+          xf (int): last x position on the screen.
+          yf (int): last y position on the screen.
+          color (int): 0 = black, 1 = white.
+          width (int): the width in pixels of the line to draw.
+        """
+        self.polyline(((xi, yi), (xf, yf)), color, width)
+
+    def polyline(self, points, color: int, width=1):
+        """
+        Draw connected lines in the image buffer.
+
+        With width bigger than 1 every line is a rectangle around it,
+        with a square on each joint, all of them filled at once (all of
+        them on the same direction, as the nonzero rule needs).
+
+        args:
+          points (list): (x, y) positions of the vertices on the screen,
+            int or float.
+          color (int): 0 = black, 1 = white.
+          width (int): the width in pixels of the lines to draw.
+        """
+        if width <= 1:
+            self._stroke(points, color, False)
+            return
+        half = width / 2
+
+        def square(x, y):
+            return (
+                (x - half, y + half), (x + half, y + half),
+                (x + half, y - half), (x - half, y - half),
+            )
+
+        contours = []
+        for n in range(len(points) - 1):
+            (xi, yi), (xf, yf) = points[n], points[n + 1]
+            if n:
+                # Square joint to fill the gap between the lines
+                contours.append(square(xi, yi))
+            dx = xf - xi
+            dy = yf - yi
+            length = sqrt(dx * dx + dy * dy)
+            if length == 0:
+                contours.append(square(xi, yi))
+                continue
+            # Half pixel along the line (to include both ends) and
+            # half width across it
+            ux, uy = 0.5 * dx / length, 0.5 * dy / length
+            nx, ny = -uy * width, ux * width
+            contours.append((
+                (xi - ux + nx, yi - uy + ny),
+                (xf + ux + nx, yf + uy + ny),
+                (xf + ux - nx, yf + uy - ny),
+                (xi - ux - nx, yi - uy - ny),
+            ))
+        self._fill(contours, color, False)
+
+    def _stroke(self, points, color: int, closed: bool):
+        """
+        Draw 1 pixel lines between the points, as boxes.
+
+        Float points are rounded to the nearest pixel.
+        """
+        points = [(round(x), round(y)) for x, y in points]
+        n_lines = len(points) if closed else len(points) - 1
+        for n in range(n_lines):
+            (xi, yi), (xf, yf) = points[n], points[(n + 1) % len(points)]
+            for xa, ya, xb, yb in line_runs(xi, yi, xf, yf):
+                self.box(xa, ya, xb, yb, color)
+
+    def _fill(self, contours, color: int, even_odd=True):
+        """
+        Fill closed contours with an edge table scanline.
+
+        The scanlines run across the bits of each byte (columns on
+        landscape, rows on portrait), so each span is written with
+        byte masks. A pixel is filled when its center is inside,
+        the vertices can be float.
+
+        args:
+          contours (list): lists of (x, y) vertices.
+          color (int): 0 = black, 1 = white.
+          even_odd (bool): even-odd rule when True, otherwise nonzero
+            rule (the union of all of them), the contours must all be
+            on the same direction.
+        """
+        image = self.image
+        portrait = self.portrait
+        if portrait:
+            # p along the bits of each byte, q across them
+            p_size, q_size = self.size
+            p_step, q_step = 1, self.size[0] >> 3
+        else:
+            q_size, p_size = self.size
+            p_step, q_step = self.size[0], 1
+
+        # Edge table: [first q, last q + 1, p at first q, p step, winding]
+        # with p in fixed point, 20 fractional bits. Both are floored, so
+        # the error is always below the exact p and small enough (for
+        # a few hundred scanlines) to not move pixels, while p still
+        # fits a small int on MicroPython
+        edges = []
+        for pts in contours:
+            if not portrait:
+                pts = [(y, x) for x, y in pts]
+            for n in range(len(pts)):
+                (pa, qa), (pb, qb) = pts[n - 1], pts[n]
+                winding = 1
+                if qa > qb:
+                    pa, qa, pb, qb = pb, qb, pa, qa
+                    winding = -1
+                start = ceil(qa)
+                stop = ceil(qb)
+                if start >= stop:
+                    continue
+                slope = (pb - pa) / (qb - qa)
+                edges.append([
+                    start, stop,
+                    floor((pa + (start - qa) * slope) * 0x100000),
+                    floor(slope * 0x100000),
+                    winding,
+                ])
+        if not edges:
+            return
+        edges.sort(key=lambda edge: edge[0])
+
+        # The active edges are updated in place on each scanline, no
+        # new lists, and kept sorted by p with an insertion step since
+        # they rarely cross between scanlines
+        active = []
+        n = 0
+        n_edges = len(edges)
+        q_last = min(max(edge[1] for edge in edges), q_size)
+        for q in range(max(edges[0][0], 0), q_last):
+            # Remove the finished edges
+            k = 0
+            for edge in active:
+                if edge[1] > q:
+                    active[k] = edge
+                    k += 1
+            del active[k:]
+
+            # Add the edges starting here (or before the screen)
+            while n < n_edges and edges[n][0] <= q:
+                edge = edges[n]
+                n += 1
+                if edge[1] > q:
+                    edge[2] += edge[3] * (q - edge[0])
+                    active.append(edge)
+
+            for i in range(1, len(active)):
+                edge = active[i]
+                p = edge[2]
+                j = i - 1
+                while j >= 0 and active[j][2] > p:
+                    active[j + 1] = active[j]
+                    j -= 1
+                active[j + 1] = edge
+
+            # Spans where the contours are inside, from the crossing
+            # going in to the one going out
+            count = 0
+            for edge in active:
+                inside = count
+                if even_odd:
+                    count ^= 1
+                else:
+                    count += edge[4]
+                if not inside:
+                    start = edge[2]
+                    continue
+                if count:
+                    continue
+                p0 = -(-start >> 20)
+                p1 = -(-edge[2] >> 20) - 1
+                if p0 < 0:
+                    p0 = 0
+                if p1 >= p_size:
+                    p1 = p_size - 1
+                if p0 > p1:
+                    continue
+
+                # Span written with byte masks, full bytes in between
+                first = q * q_step + (p0 >> 3) * p_step
+                last = q * q_step + (p1 >> 3) * p_step
+                mask = 0xff >> (p0 & 0x07)
+                end = (0xff << (7 - (p1 & 0x07))) & 0xff
+                if first == last:
+                    mask &= end
+                if color:
+                    image[first] |= mask
+                    if first != last:
+                        for index in range(first + p_step, last, p_step):
+                            image[index] = 0xff
+                        image[last] |= end
+                else:
+                    image[first] &= mask ^ 0xff
+                    if first != last:
+                        for index in range(first + p_step, last, p_step):
+                            image[index] = 0
+                        image[last] &= end ^ 0xff
+
+            for edge in active:
+                edge[2] += edge[3]
@@ -33,22 +33,34 @@ class Display:
 
     Display model: GooDisplay 2.9 inch e-paper display GDEH029A1
 
-    The pins on this module are fixed as shown below, since the
-    display is attached to the ESP8266 through the ESPaper board.
+    The default pins are shown below, since the display is attached to
+    the ESP8266 through the ESPaper board. They can be changed to drive
+    several displays sharing the same SPI bus, each one with its own
+    CS, BUSY and RESET pins.
 
-    Pinout:
+    Pinout (defaults):
       | NAME  | PIN     | DESCRIPTION                                      |
       | DC    | 5       | LOW will write COMMANDS, HIGH will write DATA    |
       | RESET | 2       | LOW will enable the RESET                        |
-      | CS    | 14      | LOW will enable comminucation to the Display     |
+      | CS    | 15      | LOW will enable comminucation to the Display     |
       | BUSY  | 4       | is HIGH when Display is busy, LOW when IDLE      |
       | SPI   | default | 4-wire communication using the SPI1 from ESP8266 |
 
     Args:
       portrait (bool): Set the (0, 0) position on the top-right corner.
       fast (bool): Set the display for partial / fast refresh.
+      spi (SPI): SPI bus to use, a new SPI1 bus (4 MHz) is created when
+        None. Pass the same object to displays sharing the bus.
+      cs (int): CS pin number, one for each display.
+      dc (int): DC pin number, may be shared between displays.
+      busy (int): BUSY pin number, one for each display.
+      rst (int): RESET pin number, one for each display (a shared
+        RESET clears the displays already initialized, see Panels).
     """
-    def __init__(self, portrait=False, fast=False):
+    def __init__(
+        self, portrait=False, fast=False,
+        spi=None, cs=15, dc=5, busy=4, rst=2
+    ):
         # Screen size (x, y)
         self.portrait = portrait
         if self.portrait:
@@ -77,13 +89,15 @@ class Display:
             )
 
         # Pins definition
-        self.dc = Pin(5, Pin.OUT)
-        self.rst = Pin(2, Pin.OUT)
-        self.cs = Pin(15, Pin.OUT)
-        self.busy = Pin(4, Pin.IN)
+        self.dc = Pin(dc, Pin.OUT)
+        self.rst = Pin(rst, Pin.OUT)
+        self.cs = Pin(cs, Pin.OUT)
+        self.busy = Pin(busy, Pin.IN)
 
         # SPI definition
-        self.spi = SPI(1, baudrate=4000000, polarity=0, phase=0)
+        if spi is None:
+            spi = SPI(1, baudrate=4000000, polarity=0, phase=0)
+        self.spi = spi
 
         # Display first cycle
         self.dc.on()
@@ -112,9 +126,13 @@ class Display:
         else:
             self.image = bytearray(b'\xff' * self.n_bytes)
 
+    def is_busy(self):
+        """Return True while the display is busy refreshing."""
+        return self.busy.value() == 1
+
     def wait_until_idle(self):
         """Display idle check to avoid sending commands when busy."""
-        while self.busy.value() == 1:
+        while self.is_busy():
             sleep_ms(10)
 
     def write_cmd(self, cmd):
@@ -212,29 +230,39 @@ class Display:
         # self.write_cmd(b'\x3c')
         # self.write_data(b'\x33')
 
-    def write_image(self):
+    def write_image(self, image=None):
         """
         Write the image to the Display RAM.
 
         Send the command to write data to RAM then send
         the IMAGE to it.
+
+        args:
+          - image (bytearray): image to be sent, self.image when None.
         """
+        if image is None:
+            image = self.image
         self.set_memory_area()
         self.set_memory_pointer()
         self.write_cmd(b'\x24')
-        self.write_data(self.image)
+        self.write_data(image)
 
-    def update(self):
+    def update(self, wait=True):
         """
         Show the image from RAM on the display.
 
         Send the command to update the display then send
         the command to activate it.
+
+        args:
+          - wait (bool): block until the refresh is done when True,
+            return right after the activation when False.
         """
         self.write_cmd(b'\x22')
         self.write_data(b'\xc4')
         self.write_cmd(b'\x20')
-        self.write_cmd(b'\xff')
+        if wait:
+            self.write_cmd(b'\xff')
 
     def full_refresh(self):
         """
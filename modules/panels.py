@@ -0,0 +1,77 @@
+"""
+MIT License
+
+Copyright (c) 2020 Rafael C. Badiale
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in all
+copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+SOFTWARE.
+"""
+from time import sleep_ms, ticks_diff, ticks_ms
+
+
+class Panels:
+    """
+    This class drives several displays sharing the same SPI bus.
+
+    Each display must have its own CS and BUSY pins, DC may be shared.
+    The image is sent to the next display while the previous ones are
+    still refreshing, so a full cycle takes about the time of the
+    slowest refresh instead of the sum of all of them.
+
+    Args:
+      displays (list): Display (or Draw) objects sharing the SPI bus.
+    """
+    def __init__(self, displays):
+        self.displays = list(displays)
+        self.cycle_time = 0
+
+        # A shared RESET pin clears the displays created before the
+        # last one, so all of them are initialized again.
+        for display in self.displays:
+            display.init()
+
+    def is_busy(self):
+        """Return True while any of the displays is busy refreshing."""
+        for display in self.displays:
+            if display.is_busy():
+                return True
+        return False
+
+    def wait_until_idle(self):
+        """Wait until every display is idle."""
+        while self.is_busy():
+            sleep_ms(10)
+
+    def refresh(self):
+        """
+        Write the image of every display then show it.
+
+        Each display is activated right after its image is sent,
+        without waiting for the refresh to end.
+
+        returns:
+          cycle_time (int): time in ms from the first write until
+            the last display is idle.
+        """
+        start = ticks_ms()
+        for display in self.displays:
+            display.write_image()
+            display.update(wait=False)
+        self.wait_until_idle()
+        self.cycle_time = ticks_diff(ticks_ms(), start)
+        return self.cycle_time